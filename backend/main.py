@@ -5,9 +5,14 @@ Uses the native get_sankey_graph() API exposed by openLCA >= 2.2.
 This replaces the old manual contribution-based approach used in openLCA 2.0.
 """
 
+import asyncio
+import functools
+import queue
 import sys
+import threading
 import time
 import logging
+from collections import OrderedDict
 
 try:
     import olca_ipc as olca
@@ -16,15 +21,51 @@ except ImportError:
     print("Error: 'olca_ipc' module not found. Install with: pip install -U olca-ipc")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # optional; the pure-Python conversion path covers small graphs
+
+import orjson
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional
 
 logging.basicConfig(level=logging.INFO)
 log = logging.getLogger("sankey-backend")
 
-app = FastAPI(title="OpenLCA Sankey Plugin", version="2.6.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Pre-warm the IPC client and descriptor caches at startup.
+
+    Moves the IPC connect and descriptor enumeration off the first
+    user-facing request, so cold-start latency matches steady state.
+    """
+    cl = get_client()
+    if cl:
+        try:
+            await asyncio.gather(
+                _cached_descriptors(cl, schema.ProductSystem),
+                _cached_descriptors(cl, schema.ImpactMethod),
+            )
+            log.info("Pre-warmed descriptor caches")
+        except Exception as e:
+            log.warning(f"Cache pre-warm failed: {e}")
+    yield
+
+
+# orjson serializes the large Sankey payloads several times faster than
+# the stdlib json encoder.
+app = FastAPI(
+    title="OpenLCA Sankey Plugin",
+    version="2.6.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,8 +75,142 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Sankey payloads are full of repeated key names and compress 5-10x;
+# level 5 keeps CPU cost low while capturing most of the size win.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 client = None
 
+# The olca-ipc Client is not thread-safe and openLCA's IPC server is
+# effectively single-writer, so all IPC calls are funneled through one
+# dedicated worker thread. Jobs are processed strictly FIFO; the bounded
+# queue makes backpressure explicit instead of piling up threads.
+_IPC_QUEUE_SIZE = 32
+
+_ipc_queue: queue.Queue = queue.Queue(maxsize=_IPC_QUEUE_SIZE)
+_ipc_thread: Optional[threading.Thread] = None
+
+
+def _ipc_worker():
+    """Consume IPC jobs from the queue and post results back to the event loop."""
+    while True:
+        job, loop, fut = _ipc_queue.get()
+        try:
+            result = job()
+        except BaseException as e:
+            loop.call_soon_threadsafe(_resolve_ipc_future, fut, None, e)
+        else:
+            loop.call_soon_threadsafe(_resolve_ipc_future, fut, result, None)
+        finally:
+            _ipc_queue.task_done()
+
+
+def _resolve_ipc_future(fut, result, error):
+    if fut.cancelled():
+        return
+    if error is not None:
+        fut.set_exception(error)
+    else:
+        fut.set_result(result)
+
+
+def _start_ipc_worker():
+    global _ipc_thread
+    if _ipc_thread is None or not _ipc_thread.is_alive():
+        _ipc_thread = threading.Thread(target=_ipc_worker, name="olca-ipc", daemon=True)
+        _ipc_thread.start()
+
+
+async def _run_ipc(fn, *args, **kwargs):
+    """Run a blocking IPC call on the worker thread without blocking the event loop."""
+    _start_ipc_worker()
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    try:
+        _ipc_queue.put_nowait((functools.partial(fn, *args, **kwargs), loop, fut))
+    except queue.Full:
+        raise HTTPException(status_code=503, detail="openLCA IPC queue is full")
+    return await fut
+
+
+# Reference units are immutable within an openLCA session; cache them by
+# category id so repeated method/Sankey requests skip the IPC round-trip.
+_ref_unit_cache: dict[str, str] = {}
+
+# Descriptor lists and resolved product systems rarely change within a
+# session, but the UI re-requests them while the user tweaks parameters.
+# A short TTL keeps them fresh enough without an IPC round-trip per hit.
+_CACHE_TTL = 60.0  # seconds
+
+_descriptor_cache: dict[type, tuple[float, list]] = {}
+_system_cache: dict[str, tuple[float, schema.ProductSystem]] = {}
+
+
+async def _cached_descriptors(cl, schema_type):
+    """Get descriptors for a schema type, cached with a short TTL."""
+    cached = _descriptor_cache.get(schema_type)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+    descriptors = await _run_ipc(cl.get_descriptors, schema_type)
+    _descriptor_cache[schema_type] = (time.monotonic(), descriptors)
+    return descriptors
+
+
+async def _cached_system(cl, system_id: str):
+    """Get a product system by id, cached with a short TTL."""
+    cached = _system_cache.get(system_id)
+    if cached and time.monotonic() - cached[0] < _CACHE_TTL:
+        return cached[1]
+    system = await _run_ipc(cl.get, schema.ProductSystem, system_id)
+    if system:
+        _system_cache[system_id] = (time.monotonic(), system)
+    return system
+
+
+# Completed Sankey responses are deterministic in their query parameters,
+# so repeat requests (e.g. the user clicking the same view twice) can be
+# answered from memory instead of re-running a seconds-to-minutes
+# calculation. LRU-evicted at a fixed size.
+_SANKEY_CACHE_SIZE = 64
+
+_sankey_cache: OrderedDict[tuple, dict] = OrderedDict()
+
+
+def _sankey_cache_get(key: tuple):
+    """Return a cached Sankey response and mark it recently used, or None."""
+    response = _sankey_cache.get(key)
+    if response is not None:
+        _sankey_cache.move_to_end(key)
+    return response
+
+
+def _sankey_cache_put(key: tuple, response: dict):
+    """Store a Sankey response, evicting the least recently used entry."""
+    _sankey_cache[key] = response
+    _sankey_cache.move_to_end(key)
+    while len(_sankey_cache) > _SANKEY_CACHE_SIZE:
+        _sankey_cache.popitem(last=False)
+
+
+def _enable_keepalive(cl) -> None:
+    """Widen the connection pool on the client's keep-alive session.
+
+    olca-ipc >= 2.x already routes every call through a requests.Session
+    held on the client (self._s), so keep-alive itself comes for free;
+    mounting a larger HTTPAdapter just gives the pool room for the many
+    small back-to-back get() calls.
+    """
+    try:
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        return
+    for attr in ("_s", "_session", "session"):
+        session = getattr(cl, attr, None)
+        if isinstance(session, Session):
+            session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+            return
+
 
 def get_client():
     """Get or create the IPC client connection to openLCA."""
@@ -43,6 +218,7 @@ def get_client():
     if client is None:
         try:
             client = olca.Client(8080)
+            _enable_keepalive(client)
             log.info("Connected to openLCA IPC on port 8080")
         except Exception as e:
             log.error(f"Failed to connect to openLCA: {e}")
@@ -51,7 +227,7 @@ def get_client():
 
 
 @app.get("/api/status")
-def get_status():
+async def get_status():
     """Check connection status to openLCA."""
     cl = get_client()
     if cl:
@@ -61,7 +237,7 @@ def get_status():
 
 
 @app.get("/api/descriptors/{model_type}")
-def get_descriptors(model_type: str):
+async def get_descriptors(model_type: str):
     """Get descriptors for a given model type."""
     cl = get_client()
     if not cl:
@@ -80,42 +256,53 @@ def get_descriptors(model_type: str):
         return []
 
     try:
-        descriptors = cl.get_descriptors(schema_type)
+        descriptors = await _cached_descriptors(cl, schema_type)
         return [d.to_dict() for d in descriptors]
+    except HTTPException:
+        raise
     except Exception as e:
         log.exception("Error fetching descriptors")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/method/{method_id}/categories")
-def get_method_categories(method_id: str):
+async def get_method_categories(method_id: str):
     """Get impact categories for a specific impact method, including ref_unit."""
     cl = get_client()
     if not cl:
         raise HTTPException(status_code=503, detail="openLCA not connected")
 
     try:
-        method = cl.get(schema.ImpactMethod, method_id)
+        method = await _run_ipc(cl.get, schema.ImpactMethod, method_id)
         if not method:
             return []
 
         categories = []
         if method.impact_categories:
-            for cat_ref in method.impact_categories:
-                # Fetch full impact category to get ref_unit
-                ref_unit = ""
-                try:
-                    full_cat = cl.get(schema.ImpactCategory, cat_ref.id)
-                    if full_cat and full_cat.ref_unit:
-                        ref_unit = full_cat.ref_unit
-                except Exception:
-                    pass
-                categories.append({
+            # Dispatch category lookups concurrently so the IPC worker drains
+            # them back-to-back, but keep the fan-out below the queue bound
+            # so a large method cannot fill the queue by itself.
+            cat_refs = list(method.impact_categories)
+            fan_out = asyncio.Semaphore(_IPC_QUEUE_SIZE // 2)
+
+            async def _bounded_ref_unit(cat_ref):
+                async with fan_out:
+                    return await _get_ref_unit(cl, cat_ref)
+
+            ref_units = await asyncio.gather(
+                *(_bounded_ref_unit(cat_ref) for cat_ref in cat_refs)
+            )
+            categories = [
+                {
                     "@id": cat_ref.id,
                     "name": cat_ref.name,
                     "refUnit": ref_unit,
-                })
+                }
+                for cat_ref, ref_unit in zip(cat_refs, ref_units)
+            ]
         return categories
+    except HTTPException:
+        raise
     except Exception as e:
         log.exception("Error fetching method categories")
         raise HTTPException(status_code=500, detail=str(e))
@@ -132,25 +319,31 @@ def _empty_result():
     }
 
 
-def _wait_for_result(result, max_wait: int = 120):
-    """Block until the calculation result is ready."""
+async def _wait_for_result(result, max_wait: int = 120):
+    """Wait until the calculation result is ready without blocking the event loop.
+
+    Polls with exponential backoff (25ms up to 500ms) so small calculations
+    finish with minimal added latency while long ones are polled gently.
+    """
     waited = 0.0
+    delay = 0.025
     while waited < max_wait:
-        state = result.get_state()
+        state = await _run_ipc(result.get_state)
         if state.is_ready:
-            log.info(f"Calculation ready after {waited:.1f}s")
+            log.info(f"Calculation ready after {waited:.2f}s")
             return
         if state.error:
             raise HTTPException(
                 status_code=500,
                 detail=f"Calculation error: {state.error}",
             )
-        time.sleep(0.5)
-        waited += 0.5
+        await asyncio.sleep(delay)
+        waited += delay
+        delay = min(delay * 1.5, 0.5)
     raise HTTPException(status_code=504, detail="Calculation timed out")
 
 
-def _resolve_impact_category(result, impact_cats, impact_category_id):
+async def _resolve_impact_category(result, impact_cats, impact_category_id):
     """Find the target impact category — user-selected or auto-selected by largest impact."""
     if impact_category_id:
         for cat in impact_cats:
@@ -158,45 +351,212 @@ def _resolve_impact_category(result, impact_cats, impact_category_id):
                 return cat
 
     # Auto-select: find the category with the largest absolute total impact
-    total_impacts_list = result.get_total_impacts()
-    impacts_by_id = {}
-    for ti in total_impacts_list:
-        if ti.impact_category:
-            impacts_by_id[ti.impact_category.id] = ti.amount or 0.0
-
-    best_cat = None
-    best_amount = 0.0
-    for cat in impact_cats:
-        amount = abs(impacts_by_id.get(cat.id, 0.0))
-        if amount > best_amount:
-            best_amount = amount
-            best_cat = cat
+    total_impacts_list = await _run_ipc(result.get_total_impacts)
+    impacts = {
+        ti.impact_category.id: ti.amount or 0.0
+        for ti in total_impacts_list
+        if ti.impact_category
+    }
 
+    best_cat = max(impact_cats, key=lambda c: abs(impacts.get(c.id, 0.0)), default=None)
     if best_cat:
-        log.info(f"Auto-selected impact category: {best_cat.name} (impact={best_amount})")
-        return best_cat
+        best_amount = abs(impacts.get(best_cat.id, 0.0))
+        if best_amount > 0.0:
+            log.info(f"Auto-selected impact category: {best_cat.name} (impact={best_amount})")
+            return best_cat
 
     return impact_cats[0] if impact_cats else None
 
 
-def _get_ref_unit(cl, impact_ref) -> str:
-    """Get the reference unit for an impact category."""
+# Graphs at or above this node count take the vectorized conversion path.
+_VECTORIZE_MIN_NODES = 200
+
+
+def _node_refs(node) -> tuple:
+    """Extract (provider name, flow name, process id) from a graph node."""
+    tech_flow = node.tech_flow
+    provider = tech_flow.provider if tech_flow else None
+    flow = tech_flow.flow if tech_flow else None
+    provider_name = (provider.name if provider else None) or "Unknown"
+    process_id = (provider.id if provider else None) or ""
+    flow_name = (flow.name if flow else None) or ""
+    return provider_name, flow_name, process_id
+
+
+def _node_payload(node, scale: float, root_index: int) -> dict:
+    """Convert one SankeyGraph node to the frontend node format."""
+    provider_name, flow_name, process_id = _node_refs(node)
+
+    direct = node.direct_result or 0.0
+    upstream = node.total_result or 0.0
+
+    return {
+        "name": provider_name,
+        "flowName": flow_name,
+        "direct": direct,
+        "upstream": upstream,
+        "directPct": abs(direct) * scale,
+        "upstreamPct": abs(upstream) * scale,
+        "processId": process_id,
+        "isRoot": node.index == root_index,
+    }
+
+
+def _nodes_data_np(nodes, scale: float, root_index: int) -> list:
+    """Vectorized node conversion: percentages for all nodes in one pass."""
+    count = len(nodes)
+    directs = np.fromiter(
+        (n.direct_result or 0.0 for n in nodes), dtype=np.float64, count=count
+    )
+    upstreams = np.fromiter(
+        (n.total_result or 0.0 for n in nodes), dtype=np.float64, count=count
+    )
+    direct_pcts = np.abs(directs) * scale
+    upstream_pcts = np.abs(upstreams) * scale
+
+    return [
+        {
+            "name": provider_name,
+            "flowName": flow_name,
+            "direct": direct,
+            "upstream": upstream,
+            "directPct": direct_pct,
+            "upstreamPct": upstream_pct,
+            "processId": process_id,
+            "isRoot": node.index == root_index,
+        }
+        for node, (provider_name, flow_name, process_id), direct, upstream, direct_pct, upstream_pct in zip(
+            nodes,
+            map(_node_refs, nodes),
+            directs.tolist(),
+            upstreams.tolist(),
+            direct_pcts.tolist(),
+            upstream_pcts.tolist(),
+        )
+    ]
+
+
+def _dense_positions(index_to_pos: dict):
+    """Build a flat index->position list when node indices are dense.
+
+    Node indices are usually contiguous small ints, so a list lookup avoids
+    hashing in the per-edge hot loop. Returns None for sparse or negative
+    indices, in which case callers fall back to the dict.
+    """
+    if not index_to_pos:
+        return None
+    max_idx = max(index_to_pos)
+    if min(index_to_pos) < 0 or max_idx >= 4 * len(index_to_pos):
+        return None
+    positions = [None] * (max_idx + 1)
+    for idx, pos in index_to_pos.items():
+        positions[idx] = pos
+    return positions
+
+
+def _links_data(edges, abs_total: float, index_to_pos: dict, vectorize: bool) -> list:
+    """Convert graph edges to frontend links.
+
+    Link values are computed vectorized for large graphs; position lookups
+    use a dense list when node indices allow it.
+    """
+    if vectorize:
+        shares_arr = np.fromiter(
+            (e.upstream_share or 0.0 for e in edges), dtype=np.float64, count=len(edges)
+        )
+        shares = shares_arr.tolist()
+        values = (np.abs(shares_arr) * abs_total).tolist()
+    else:
+        shares = [e.upstream_share or 0.0 for e in edges]
+        values = [abs(share) * abs_total for share in shares]
+
+    links = []
+    positions = _dense_positions(index_to_pos)
+    if positions is not None:
+        size = len(positions)
+        for edge, share, value in zip(edges, shares, values):
+            s_idx = edge.provider_index
+            t_idx = edge.node_index
+            source_pos = positions[s_idx] if 0 <= s_idx < size else None
+            target_pos = positions[t_idx] if 0 <= t_idx < size else None
+            if source_pos is not None and target_pos is not None and source_pos != target_pos:
+                links.append({
+                    "source": source_pos,
+                    "target": target_pos,
+                    "value": value,
+                    "share": share,
+                })
+    else:
+        pos_of = index_to_pos.get
+        for edge, share, value in zip(edges, shares, values):
+            source_pos = pos_of(edge.provider_index)
+            target_pos = pos_of(edge.node_index)
+            if source_pos is not None and target_pos is not None and source_pos != target_pos:
+                links.append({
+                    "source": source_pos,
+                    "target": target_pos,
+                    "value": value,
+                    "share": share,
+                })
+    return links
+
+
+# Responses at or above this node count are streamed instead of being
+# serialized into one in-memory JSON string. Matches _VECTORIZE_MIN_NODES
+# and stays well below the max_nodes request cap so it is reachable.
+_STREAM_MIN_NODES = 200
+
+
+def _stream_sankey(response: dict):
+    """Yield a Sankey response as incrementally serialized JSON."""
+    yield b'{"nodes":['
+    for i, node in enumerate(response["nodes"]):
+        if i:
+            yield b","
+        yield orjson.dumps(node)
+    yield b'],"links":['
+    for i, link in enumerate(response["links"]):
+        if i:
+            yield b","
+        yield orjson.dumps(link)
+    yield b"],"
+    scalars = {k: v for k, v in response.items() if k not in ("nodes", "links")}
+    yield orjson.dumps(scalars)[1:]  # strip the "{" to splice into the object
+
+
+def _sankey_response(response: dict):
+    """Return a Sankey response, streamed incrementally when it is large."""
+    if len(response["nodes"]) >= _STREAM_MIN_NODES:
+        return StreamingResponse(_stream_sankey(response), media_type="application/json")
+    return response
+
+
+async def _get_ref_unit(cl, impact_ref) -> str:
+    """Get the reference unit for an impact category, cached by category id."""
+    if impact_ref.id in _ref_unit_cache:
+        return _ref_unit_cache[impact_ref.id]
+    ref_unit = ""
     try:
-        full_cat = cl.get(schema.ImpactCategory, impact_ref.id)
+        full_cat = await _run_ipc(cl.get, schema.ImpactCategory, impact_ref.id)
         if full_cat and full_cat.ref_unit:
-            return full_cat.ref_unit
+            ref_unit = full_cat.ref_unit
+    except HTTPException:
+        # Backpressure (queue full) must surface, not degrade into empty units.
+        raise
     except Exception:
-        pass
-    return ""
+        return ""
+    _ref_unit_cache[impact_ref.id] = ref_unit
+    return ref_unit
 
 
 @app.get("/api/sankey/{system_id}")
-def get_sankey(
+async def get_sankey(
     system_id: str,
     impact_method_id: Optional[str] = Query(None),
     impact_category_id: Optional[str] = Query(None),
-    max_nodes: int = Query(25),
-    min_share: float = Query(0.0),
+    max_nodes: int = Query(25, ge=1, le=500),
+    min_share: float = Query(0.0, ge=0.0, le=100.0),
+    nocache: bool = Query(False),
 ):
     """
     Get Sankey diagram data using the native get_sankey_graph() API.
@@ -211,14 +571,14 @@ def get_sankey(
 
     try:
         # Load product system
-        system = cl.get(schema.ProductSystem, system_id)
+        system = await _cached_system(cl, system_id)
         if not system:
             raise HTTPException(status_code=404, detail="Product system not found")
 
         log.info(f"Calculating Sankey for: {system.name}")
 
         # Resolve impact method
-        impact_methods = cl.get_descriptors(schema.ImpactMethod)
+        impact_methods = await _cached_descriptors(cl, schema.ImpactMethod)
         if not impact_methods:
             log.warning("No impact methods found in database")
             return _empty_result()
@@ -234,6 +594,21 @@ def get_sankey(
 
         log.info(f"Using impact method: {method_ref.name}")
 
+        # Repeat requests with the same parameters return the memoized
+        # response instead of re-running the calculation.
+        cache_key = (
+            system_id,
+            method_ref.id,
+            impact_category_id or "auto",
+            max_nodes,
+            min_share,
+        )
+        if not nocache:
+            cached_response = _sankey_cache_get(cache_key)
+            if cached_response is not None:
+                log.info("Returning cached Sankey response")
+                return _sankey_response(cached_response)
+
         # Setup calculation
         setup = schema.CalculationSetup(
             target=system.to_ref(),
@@ -242,38 +617,40 @@ def get_sankey(
         )
 
         # Run calculation
-        result = cl.calculate(setup)
+        result = await _run_ipc(cl.calculate, setup)
         if result.error:
             log.error(f"Calculation error: {result.error}")
             return _empty_result()
 
-        _wait_for_result(result)
+        await _wait_for_result(result)
 
         # Get impact categories from result
-        impact_cats = result.get_impact_categories()
+        impact_cats = await _run_ipc(result.get_impact_categories)
         if not impact_cats:
             log.warning("No impact categories in result")
-            result.dispose()
+            await _run_ipc(result.dispose)
             return _empty_result()
 
         # Resolve target impact category
-        target_impact = _resolve_impact_category(
+        target_impact = await _resolve_impact_category(
             result, impact_cats, impact_category_id
         )
         if not target_impact:
-            result.dispose()
+            await _run_ipc(result.dispose)
             return _empty_result()
 
         log.info(f"Using impact category: {target_impact.name}")
 
-        # Get total impact for this category
-        total_impact_value = result.get_total_impact_value_of(target_impact)
+        # Fetch the category total and its reference unit together; the two
+        # lookups are independent, so they pipeline through the IPC worker
+        # instead of paying one awaited round-trip each.
+        total_impact_value, ref_unit = await asyncio.gather(
+            _run_ipc(result.get_total_impact_value_of, target_impact),
+            _get_ref_unit(cl, target_impact),
+        )
         total_impact = total_impact_value.amount if total_impact_value and total_impact_value.amount else 0.0
         log.info(f"Total impact: {total_impact}")
 
-        # Get the impact category's reference unit
-        ref_unit = _get_ref_unit(cl, target_impact)
-
         # ---- Native Sankey Graph API (openLCA >= 2.2) ----
         sankey_config = schema.SankeyRequest(
             impact_category=target_impact,
@@ -281,67 +658,37 @@ def get_sankey(
             min_share=min_share / 100.0,  # API expects fraction, UI sends percentage
         )
 
-        sankey_graph = result.get_sankey_graph(sankey_config)
-        result.dispose()
+        sankey_graph = await _run_ipc(result.get_sankey_graph, sankey_config)
+        await _run_ipc(result.dispose)
 
         if not sankey_graph or not sankey_graph.nodes:
             log.warning("Sankey graph is empty")
             return _empty_result()
 
-        # Convert SankeyGraph to frontend format
+        # Convert SankeyGraph to frontend format. abs_total is never zero,
+        # so the percentage scale and edge-value factor hoist out of the loops.
         abs_total = abs(total_impact) if total_impact != 0 else 1.0
-
-        nodes_data = []
-        index_to_pos = {}  # map graph node index -> position in nodes_data list
-
-        for i, node in enumerate(sankey_graph.nodes):
-            index_to_pos[node.index] = i
-
-            provider_name = "Unknown"
-            flow_name = ""
-            process_id = ""
-            if node.tech_flow:
-                if node.tech_flow.provider:
-                    provider_name = node.tech_flow.provider.name or "Unknown"
-                    process_id = node.tech_flow.provider.id or ""
-                if node.tech_flow.flow:
-                    flow_name = node.tech_flow.flow.name or ""
-
-            direct = node.direct_result or 0.0
-            upstream = node.total_result or 0.0
-
-            nodes_data.append({
-                "name": provider_name,
-                "flowName": flow_name,
-                "direct": direct,
-                "upstream": upstream,
-                "directPct": abs(direct / abs_total) * 100 if abs_total != 0 else 0,
-                "upstreamPct": abs(upstream / abs_total) * 100 if abs_total != 0 else 0,
-                "processId": process_id,
-                "isRoot": node.index == sankey_graph.root_index,
-            })
+        scale = 100.0 / abs_total
+        vectorize = np is not None and len(sankey_graph.nodes) >= _VECTORIZE_MIN_NODES
+
+        if vectorize:
+            nodes_data = _nodes_data_np(sankey_graph.nodes, scale, sankey_graph.root_index)
+        else:
+            nodes_data = [
+                _node_payload(node, scale, sankey_graph.root_index)
+                for node in sankey_graph.nodes
+            ]
+        # map graph node index -> position in nodes_data list
+        index_to_pos = {node.index: i for i, node in enumerate(sankey_graph.nodes)}
 
         # Build links from edges
         links_data = []
         if sankey_graph.edges:
-            for edge in sankey_graph.edges:
-                source_pos = index_to_pos.get(edge.provider_index)
-                target_pos = index_to_pos.get(edge.node_index)
-
-                if source_pos is not None and target_pos is not None and source_pos != target_pos:
-                    share = edge.upstream_share or 0.0
-                    value = abs(share * abs_total) if abs_total != 0 else 0.001
-
-                    links_data.append({
-                        "source": source_pos,
-                        "target": target_pos,
-                        "value": value,
-                        "share": share,
-                    })
+            links_data = _links_data(sankey_graph.edges, abs_total, index_to_pos, vectorize)
 
         log.info(f"Sankey graph: {len(nodes_data)} nodes, {len(links_data)} edges")
 
-        return {
+        response = {
             "nodes": nodes_data,
             "links": links_data,
             "totalImpact": total_impact,
@@ -350,6 +697,16 @@ def get_sankey(
             "rootIndex": index_to_pos.get(sankey_graph.root_index, 0),
         }
 
+        # Store under both the requested key and the key normalized to the
+        # resolved category, so an "auto" request and an explicit request
+        # that resolve to the same category share one cache entry.
+        _sankey_cache_put(cache_key, response)
+        resolved_key = (system_id, method_ref.id, target_impact.id, max_nodes, min_share)
+        if resolved_key != cache_key:
+            _sankey_cache_put(resolved_key, response)
+
+        return _sankey_response(response)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -359,9 +716,24 @@ def get_sankey(
 
 # Keep old endpoint for backward compatibility
 @app.get("/api/graph/{system_id}")
-def get_graph(system_id: str):
-    return get_sankey(system_id)
+async def get_graph(system_id: str):
+    return await get_sankey(system_id)
+
+
+@app.post("/api/cache/clear")
+async def clear_cache():
+    """Invalidate cached lookups after the openLCA database changes."""
+    _ref_unit_cache.clear()
+    _descriptor_cache.clear()
+    _system_cache.clear()
+    _sankey_cache.clear()
+    return {"status": "cleared"}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "auto"  # uvloop is not available on Windows
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop)